@@ -15,15 +15,36 @@ only 2 documents.  The new pipeline delivers both a similarity score AND a list
 of concrete issues so the user immediately sees WHAT is different, not just a %.
 """
 
+import numpy as np
 from sklearn.feature_extraction.text import TfidfVectorizer
 from sklearn.metrics.pairwise import cosine_similarity
-from typing import Literal
+from types import MappingProxyType
+from typing import Iterator, Literal, Mapping, TypedDict
 from difflib import SequenceMatcher
+try:
+    # C port of difflib's matcher — same opcodes/ratios, far less CPU
+    from cdifflib import CSequenceMatcher as SequenceMatcher
+except ImportError:
+    pass
+try:
+    # Bit-parallel Indel (2*M/T) similarity in C++ for the title hot path
+    from rapidfuzz.distance import Indel as _Indel
+    from rapidfuzz.process import cdist as _rf_cdist
+except ImportError:
+    _Indel = None
+    _rf_cdist = None
+from bisect import bisect_right
+import asyncio
+import copy
+import functools
+import os
 import re
 import string
 import random
+import time
 import math
-from collections import Counter
+from collections import Counter, OrderedDict
+from itertools import combinations
 
 from translator import translate_descriptions, detect_language, LANGUAGE_NAMES, REGION_LANGUAGES
 
@@ -31,6 +52,22 @@ from translator import translate_descriptions, detect_language, LANGUAGE_NAMES,
 RiskLevel = Literal["LOW", "MEDIUM", "HIGH"]
 
 
+# Result shapes, mirroring the DiffPart / TitleMismatch response models in
+# main.py.  Plain dicts at runtime so results stay JSON-serialisable as-is.
+class DiffSpan(TypedDict):
+    type: Literal["equal", "insert", "delete"]
+    text: str
+
+
+class Mismatch(TypedDict):
+    region_1: str
+    region_2: str
+    title_1: str
+    title_2: str
+    similarity: float
+    diff: list[DiffSpan]
+
+
 class TextPreprocessor:
     """Advanced text preprocessing for improved similarity detection."""
     
@@ -130,7 +167,13 @@ class TextPreprocessor:
         'superior': 'premium', 'excellent': 'premium', 'outstanding': 'premium',
         'exceptional': 'premium', 'remarkable': 'premium',
     }
-    
+
+    # Multi-word phrases, longest first — built once instead of per preprocess() call
+    MULTI_WORD_SYNONYMS: list[tuple[str, str]] = sorted(
+        ((phrase, replacement) for phrase, replacement in SYNONYMS.items() if ' ' in phrase),
+        key=lambda x: -len(x[0]),
+    )
+
     @classmethod
     def preprocess(cls, text: str) -> str:
         """Comprehensive text preprocessing for maximum similarity accuracy."""
@@ -159,8 +202,8 @@ class TextPreprocessor:
         # Synonym normalisation
         words = [cls.SYNONYMS.get(w, w) for w in words]
         text = ' '.join(words)
-        for phrase, replacement in sorted(cls.SYNONYMS.items(), key=lambda x: -len(x[0])):
-            if ' ' in phrase and phrase in text:
+        for phrase, replacement in cls.MULTI_WORD_SYNONYMS:
+            if phrase in text:
                 text = text.replace(phrase, replacement)
         words = text.split()
         words = [w for w in words if w not in cls.STOP_WORDS and len(w) > 1]
@@ -168,25 +211,22 @@ class TextPreprocessor:
         return ' '.join(words)
 
     @classmethod
-    def extract_key_features(cls, text: str) -> set:
+    def extract_key_features(cls, text: str) -> frozenset[str]:
         """Extract key product features for comparison."""
-        features = set()
+        features: list[str] = []
         text_lower = text.lower()
         number_patterns = re.findall(
             r'\d+\.?\d*\s*(?:oz|ml|l|gb|mb|tb|mah|ah|v|w|hz|hours?|hrs?|mins?|minutes?|days?|inch|inches|cm|mm|feet|ft|atm)',
             text_lower
         )
-        features.update([re.sub(r'\s+', '', p) for p in number_patterns])
-        ip_ratings = re.findall(r'ip[x]?\d+', text_lower)
-        features.update(ip_ratings)
+        features.extend(re.sub(r'\s+', '', p) for p in number_patterns)
+        features.extend(re.findall(r'ip[x]?\d+', text_lower))
         colors = ['black', 'white', 'red', 'blue', 'green', 'yellow', 'orange', 'purple',
                   'pink', 'brown', 'gray', 'grey', 'silver', 'gold', 'bronze', 'rose gold',
                   'navy', 'teal', 'coral', 'beige', 'cream', 'midnight', 'space gray']
-        for color in colors:
-            if color in text_lower:
-                features.add(color.replace(' ', ''))
+        features.extend(color.replace(' ', '') for color in colors if color in text_lower)
         brands = re.findall(r'\b[A-Z][a-zA-Z]{2,}\b', text)
-        features.update([b.lower() for b in brands if len(b) > 2])
+        features.extend(b.lower() for b in brands if len(b) > 2)
         feature_keywords = [
             'bluetooth', 'wireless', 'wired', 'usb', 'nfc', 'wifi', 'gps',
             'touchscreen', 'oled', 'lcd', 'amoled', 'retina',
@@ -198,28 +238,28 @@ class TextPreprocessor:
             'microphone', 'mic', 'speaker', 'driver', 'amplifier',
             'ios', 'android', 'windows', 'macos', 'linux',
         ]
-        for kw in feature_keywords:
-            if kw in text_lower:
-                features.add(kw)
-        return features
+        features.extend(kw for kw in feature_keywords if kw in text_lower)
+        return frozenset(features)
+
+    # Precompiled (spec key, pattern, type).  Each spec is searched on its
+    # own: the patterns overlap ("16 oz" is both a weight and a capacity), so
+    # a single alternation would let one token fill only one of them.
+    NUMERIC_SPEC_PATTERNS = (
+        ('battery_hours', re.compile(r'(\d+)\s*(?:hour|hr|h)\s*(?:battery|playback|listening)?'), int),
+        ('weight', re.compile(r'(\d+\.?\d*)\s*(?:oz|ounce|g|gram|kg|lb|pound)'), float),
+        ('capacity', re.compile(r'(\d+)\s*(?:oz|ml|l|liter|litre)'), int),
+        ('screen_size', re.compile(r'(\d+\.?\d*)\s*(?:inch|in)'), float),
+    )
 
     @classmethod
     def extract_numeric_specs(cls, text: str) -> dict:
         """Extract numeric specifications from text."""
         specs = {}
         text_lower = text.lower()
-        battery_match = re.search(r'(\d+)\s*(?:hour|hr|h)\s*(?:battery|playback|listening)?', text_lower)
-        if battery_match:
-            specs['battery_hours'] = int(battery_match.group(1))
-        weight_match = re.search(r'(\d+\.?\d*)\s*(?:oz|ounce|g|gram|kg|lb|pound)', text_lower)
-        if weight_match:
-            specs['weight'] = float(weight_match.group(1))
-        capacity_match = re.search(r'(\d+)\s*(?:oz|ml|l|liter|litre)', text_lower)
-        if capacity_match:
-            specs['capacity'] = int(capacity_match.group(1))
-        screen_match = re.search(r'(\d+\.?\d*)\s*(?:inch|in)', text_lower)
-        if screen_match:
-            specs['screen_size'] = float(screen_match.group(1))
+        for key, pattern, cast in cls.NUMERIC_SPEC_PATTERNS:
+            m = pattern.search(text_lower)
+            if m:
+                specs[key] = cast(m.group(1))
         return specs
 
 
@@ -451,10 +491,19 @@ class ContentCoverageAnalyzer:
         return claims
 
     @classmethod
-    def find_gaps(cls, text1: str, text2: str) -> dict:
+    def find_gaps(
+        cls,
+        text1: str,
+        text2: str,
+        *,
+        claims1: list[str] | None = None,
+        claims2: list[str] | None = None,
+    ) -> dict:
         """Find claims in text1 not covered in text2 and vice-versa."""
-        claims1 = cls.extract_claims(text1)
-        claims2 = cls.extract_claims(text2)
+        if claims1 is None:
+            claims1 = cls.extract_claims(text1)
+        if claims2 is None:
+            claims2 = cls.extract_claims(text2)
         text1_lower = text1.lower()
         text2_lower = text2.lower()
 
@@ -480,7 +529,13 @@ class ContentCoverageAnalyzer:
 #  NEW TECHNIQUE 5 — Structural Consistency
 # =====================================================================
 
-def structural_similarity(text1: str, text2: str) -> dict:
+def structural_similarity(
+    text1: str,
+    text2: str,
+    *,
+    sents1: list[str] | None = None,
+    sents2: list[str] | None = None,
+) -> dict:
     """
     Compare structural properties: length ratio, sentence count ratio,
     bullet-point count ratio.  Returns a score 0-1 and details.
@@ -488,8 +543,10 @@ def structural_similarity(text1: str, text2: str) -> dict:
     len1, len2 = len(text1), len(text2)
     length_ratio = min(len1, len2) / max(len1, len2) if max(len1, len2) > 0 else 1.0
 
-    sents1 = SentenceAnalyzer.split_sentences(text1)
-    sents2 = SentenceAnalyzer.split_sentences(text2)
+    if sents1 is None:
+        sents1 = SentenceAnalyzer.split_sentences(text1)
+    if sents2 is None:
+        sents2 = SentenceAnalyzer.split_sentences(text2)
     s1, s2 = len(sents1), len(sents2)
     sentence_ratio = min(s1, s2) / max(s1, s2) if max(s1, s2) > 0 else 1.0
 
@@ -632,10 +689,13 @@ def calculate_sequence_similarity(text1: str, text2: str) -> float:
 
 
 def calculate_jaccard_similarity(words1: set, words2: set) -> float:
-    """Jaccard similarity between two word sets."""
-    if not words1 or not words2:
-        return 0.0
-    return len(words1 & words2) / len(words1 | words2)
+    """
+    Jaccard similarity between two word sets.
+    Union size comes from inclusion-exclusion so no union set is allocated.
+    """
+    inter = len(words1 & words2)
+    union = len(words1) + len(words2) - inter
+    return inter / union if union else 0.0
 
 
 def calculate_bigram_jaccard(text1: str, text2: str) -> float:
@@ -646,16 +706,96 @@ def calculate_bigram_jaccard(text1: str, text2: str) -> float:
         return calculate_jaccard_similarity(set(w1), set(w2))
     bg1 = set(zip(w1, w1[1:]))
     bg2 = set(zip(w2, w2[1:]))
-    return len(bg1 & bg2) / len(bg1 | bg2) if (bg1 | bg2) else 0.0
+    return calculate_jaccard_similarity(bg1, bg2)
+
+
+# TF-IDF settings.  Bigrams are the ceiling on purpose: descriptions are only
+# ~60-100 tokens, so trigrams mostly add noise and inflate vocabulary build cost.
+TFIDF_PARAMS: dict = {
+    'lowercase': True,
+    'ngram_range': (1, 2),
+    'max_features': 5000,
+    'min_df': 1,
+    'sublinear_tf': True,
+    'norm': 'l2',
+}
+
+# Metric-spread cut-offs for confidence: < 0.15 → HIGH, < 0.30 → MEDIUM, else LOW
+_CONFIDENCE_THRESHOLDS = (0.15, 0.30)
+_CONFIDENCE_LEVELS = ('HIGH', 'MEDIUM', 'LOW')
+
+
+def _combine_scores(
+    ngram_dice: float,
+    bigram_jac: float,
+    word_jac: float,
+    sequence: float,
+    sent_score: float,
+    feature_overlap: float,
+    spec_match: float,
+    struct_score: float,
+    tfidf_cosine: float,
+) -> tuple[float, str]:
+    """
+    Numeric core of the pipeline: weighted combined score plus a confidence
+    level from how closely the text-level metrics agree.  Pure float-in /
+    float-out so it stays trivially cheap (and compilable, should it ever
+    show up in a profile).
+    """
+    # Spec conflicts are the most critical signal for product consistency
+    combined_score = (
+        ngram_dice       * 0.20 +   # Character-level fuzzy similarity
+        bigram_jac       * 0.10 +   # Phrase-level overlap
+        word_jac         * 0.10 +   # Word-level overlap
+        sequence         * 0.10 +   # Order-sensitive similarity
+        sent_score       * 0.15 +   # Sentence alignment quality
+        feature_overlap  * 0.10 +   # Domain-specific features
+        spec_match       * 0.15 +   # Spec consistency (critical)
+        struct_score     * 0.05 +   # Structural similarity
+        tfidf_cosine     * 0.05     # Legacy TF-IDF (supplementary)
+    )
+
+    # Confidence = agreement among metrics
+    variance = (
+        max(ngram_dice, bigram_jac, word_jac, sequence, sent_score, feature_overlap)
+        - min(ngram_dice, bigram_jac, word_jac, sequence, sent_score, feature_overlap)
+    )
+    return combined_score, _CONFIDENCE_LEVELS[bisect_right(_CONFIDENCE_THRESHOLDS, variance)]
 
 
-def calculate_similarity_advanced(text1: str, text2: str) -> dict:
+def text_profile(text: str) -> dict:
+    """
+    Everything calculate_similarity_advanced derives from a single text.
+    Batch callers build one per region instead of re-deriving it per pair.
+    """
+    processed = TextPreprocessor.preprocess(text)
+    return {
+        'processed': processed,
+        'words': frozenset(processed.split()),
+        'sentences': SentenceAnalyzer.split_sentences(text),
+        'features': TextPreprocessor.extract_key_features(text),
+        'specs': SpecExtractor.extract(text),
+        'claims': ContentCoverageAnalyzer.extract_claims(text),
+    }
+
+
+def calculate_similarity_advanced(
+    text1: str,
+    text2: str,
+    *,
+    profile1: dict | None = None,
+    profile2: dict | None = None,
+    tfidf_cosine: float | None = None,
+) -> dict:
     """
     Multi-dimensional similarity analysis using 6 complementary techniques.
 
     Returns detailed per-dimension scores plus a weighted combined score.
     Replaces the old TF-IDF-centric approach (TF-IDF is kept as one signal
     but is no longer dominant — its IDF component is weak with only 2 docs).
+
+    Batch callers may pass each text's text_profile() and a TF-IDF cosine
+    computed over the whole region set to skip the per-pair work.
     """
     empty = {
         'ngram_dice': 0.0,
@@ -678,8 +818,12 @@ def calculate_similarity_advanced(text1: str, text2: str) -> dict:
     if not text1 or not text2:
         return empty
 
-    processed1 = TextPreprocessor.preprocess(text1)
-    processed2 = TextPreprocessor.preprocess(text2)
+    if profile1 is None:
+        profile1 = text_profile(text1)
+    if profile2 is None:
+        profile2 = text_profile(text2)
+    processed1 = profile1['processed']
+    processed2 = profile2['processed']
     if not processed1 or not processed2:
         return empty
 
@@ -690,30 +834,28 @@ def calculate_similarity_advanced(text1: str, text2: str) -> dict:
     bigram_jac = calculate_bigram_jaccard(processed1, processed2)
 
     # ── 3  Word-level Jaccard (bag-of-words overlap) ──────────────
-    words1 = set(processed1.split())
-    words2 = set(processed2.split())
-    word_jac = calculate_jaccard_similarity(words1, words2)
+    word_jac = calculate_jaccard_similarity(profile1['words'], profile2['words'])
 
     # ── 4  Sequence similarity (order-sensitive) ──────────────────
     sequence = calculate_sequence_similarity(processed1, processed2)
 
     # ── 5  Sentence-level alignment ───────────────────────────────
-    sents1 = SentenceAnalyzer.split_sentences(text1)
-    sents2 = SentenceAnalyzer.split_sentences(text2)
+    sents1 = profile1['sentences']
+    sents2 = profile2['sentences']
     sent_alignment = SentenceAnalyzer.align_sentences(sents1, sents2)
     sent_score = sent_alignment['alignment_score']
 
     # ── 6  Feature overlap ────────────────────────────────────────
-    features1 = TextPreprocessor.extract_key_features(text1)
-    features2 = TextPreprocessor.extract_key_features(text2)
+    features1 = profile1['features']
+    features2 = profile2['features']
     if features1 or features2:
-        feature_overlap = len(features1 & features2) / len(features1 | features2)
+        feature_overlap = calculate_jaccard_similarity(features1, features2)
     else:
         feature_overlap = 1.0
 
     # ── 7  Spec extraction & consistency ──────────────────────────
-    specs1 = SpecExtractor.extract(text1)
-    specs2 = SpecExtractor.extract(text2)
+    specs1 = profile1['specs']
+    specs2 = profile2['specs']
     all_spec_keys = set(specs1.keys()) | set(specs2.keys())
     if all_spec_keys:
         common = set(specs1.keys()) & set(specs2.keys())
@@ -736,46 +878,28 @@ def calculate_similarity_advanced(text1: str, text2: str) -> dict:
         }
 
     # ── 8  Structural similarity ──────────────────────────────────
-    struct = structural_similarity(text1, text2)
+    struct = structural_similarity(text1, text2, sents1=sents1, sents2=sents2)
     struct_score = struct['score']
 
     # ── 9  TF-IDF cosine (kept as supplementary signal) ──────────
-    try:
-        vectorizer = TfidfVectorizer(
-            lowercase=True, ngram_range=(1, 2), max_features=5000,
-            min_df=1, sublinear_tf=True, norm='l2',
-        )
-        tfidf_matrix = vectorizer.fit_transform([processed1, processed2])
-        tfidf_cosine = float(cosine_similarity(tfidf_matrix[0:1], tfidf_matrix[1:2])[0][0])
-    except Exception:
-        tfidf_cosine = 0.0
+    if tfidf_cosine is None:
+        try:
+            vectorizer = TfidfVectorizer(**TFIDF_PARAMS)
+            tfidf_matrix = vectorizer.fit_transform([processed1, processed2])
+            tfidf_cosine = float(cosine_similarity(tfidf_matrix[0:1], tfidf_matrix[1:2])[0][0])
+        except Exception:
+            tfidf_cosine = 0.0
 
     # ── 10 Content-gap analysis ───────────────────────────────────
-    content_gaps = ContentCoverageAnalyzer.find_gaps(text1, text2)
-
-    # ── Combined Score (redesigned weighting) ─────────────────────
-    # Spec conflicts are the most critical signal for product consistency
-    combined_score = (
-        ngram_dice       * 0.20 +   # Character-level fuzzy similarity
-        bigram_jac       * 0.10 +   # Phrase-level overlap
-        word_jac         * 0.10 +   # Word-level overlap
-        sequence         * 0.10 +   # Order-sensitive similarity
-        sent_score       * 0.15 +   # Sentence alignment quality
-        feature_overlap  * 0.10 +   # Domain-specific features
-        spec_match       * 0.15 +   # Spec consistency (critical)
-        struct_score     * 0.05 +   # Structural similarity
-        tfidf_cosine     * 0.05     # Legacy TF-IDF (supplementary)
+    content_gaps = ContentCoverageAnalyzer.find_gaps(
+        text1, text2, claims1=profile1['claims'], claims2=profile2['claims'],
     )
 
-    # ── Confidence (agreement among metrics) ──────────────────────
-    metric_vals = [ngram_dice, bigram_jac, word_jac, sequence, sent_score, feature_overlap]
-    variance = max(metric_vals) - min(metric_vals)
-    if variance < 0.15:
-        confidence = 'HIGH'
-    elif variance < 0.30:
-        confidence = 'MEDIUM'
-    else:
-        confidence = 'LOW'
+    # ── Combined Score + confidence ───────────────────────────────
+    combined_score, confidence = _combine_scores(
+        ngram_dice, bigram_jac, word_jac, sequence, sent_score,
+        feature_overlap, spec_match, struct_score, tfidf_cosine,
+    )
 
     return {
         'ngram_dice': round(ngram_dice, 4),
@@ -797,6 +921,19 @@ def calculate_similarity_advanced(text1: str, text2: str) -> dict:
     }
 
 
+def tfidf_similarity_matrix(docs: list[str]):
+    """
+    Fit one TF-IDF model over all documents and return the dense pairwise
+    cosine matrix (rows are L2-normalised, so X @ X.T is the cosine).
+    Returns None if no vocabulary can be built (e.g. every doc is empty).
+    """
+    try:
+        matrix = TfidfVectorizer(**TFIDF_PARAMS).fit_transform(docs)
+    except ValueError:
+        return None
+    return (matrix @ matrix.T).toarray()
+
+
 def calculate_similarity(text1: str, text2: str) -> float:
     """
     Calculate final similarity score between two text descriptions.
@@ -935,7 +1072,21 @@ MOCK_TITLES: dict[str, dict[str, str]] = {
 }
 
 
-def get_mock_descriptions(asin: str) -> dict[str, str]:
+def _cached_read_only(builder):
+    """
+    Memoise a deterministic per-ASIN mock builder.  The cached mapping is
+    shared between callers, so it is handed out as a read-only view; copy
+    with dict(...) before mutating.
+    """
+    @functools.lru_cache(maxsize=8192)
+    @functools.wraps(builder)
+    def cached(asin: str) -> Mapping[str, str]:
+        return MappingProxyType(builder(asin))
+    return cached
+
+
+@_cached_read_only
+def get_mock_descriptions(asin: str) -> Mapping[str, str]:
     """
     Get mock descriptions for a given ASIN.
     If ASIN not found, generate deterministic variations based on ASIN hash.
@@ -1020,7 +1171,8 @@ def get_mock_descriptions(asin: str) -> dict[str, str]:
         }
 
 
-def get_mock_titles(asin: str) -> dict[str, str]:
+@_cached_read_only
+def get_mock_titles(asin: str) -> Mapping[str, str]:
     """
     Get mock titles for a given ASIN.
     Generate realistic region-specific titles for unknown ASINs.
@@ -1071,11 +1223,14 @@ def get_mock_titles(asin: str) -> dict[str, str]:
     return categories[asin_hash % len(categories)]
 
 
+_TOKEN_RE = re.compile(r'\w+|[^\w\s]', re.UNICODE)
+
+
 def tokenize_title(text: str) -> list[str]:
     """
     Tokenize title into words and punctuation for better diffing.
     """
-    return re.findall(r'\w+|[^\w\s]', text, re.UNICODE)
+    return _TOKEN_RE.findall(text)
 
 
 def calculate_title_similarity(t1: str, t2: str) -> float:
@@ -1083,52 +1238,109 @@ def calculate_title_similarity(t1: str, t2: str) -> float:
     Calculate a robust similarity score for titles.
     Combines Jaccard (word overlap) and Sequence (character order) similarity.
     """
-    # Normalize
     t1_norm = t1.lower()
     t2_norm = t2.lower()
+    mask1, mask2 = _word_masks((t1_norm, t2_norm))
+    return _title_sim(t1_norm, t2_norm, mask1, mask2)
+
+
+def _word_masks(texts) -> list[int]:
+    """
+    Encode each text's distinct words as an int bitmask over a vocabulary
+    local to this call (bit k set = k-th word seen).  Word-set Jaccard then
+    becomes two big-int ops plus popcounts instead of set hashing.
+    """
+    vocab: dict[str, int] = {}
+    masks = []
+    for text in texts:
+        mask = 0
+        for word in text.split():
+            mask |= 1 << vocab.setdefault(word, len(vocab))
+        masks.append(mask)
+    return masks
+
+
+def _title_sim(
+    t1_norm: str,
+    t2_norm: str,
+    mask1: int,
+    mask2: int,
+    sequence: float | None = None,
+) -> float:
+    """
+    calculate_title_similarity on pre-lowercased titles and their _word_masks.
+    ``sequence`` may carry a precomputed order similarity (see
+    _title_sequence_matrix).
+    """
+    # Identical titles (the common case across English regions) need no matching
+    if t1_norm == t2_norm and t1_norm.strip():
+        return 1.0
     
     # 1. Jaccard Similarity (Word Overlap)
-    # Use simple split for Jaccard to avoid punctuation noise
-    words1 = set(t1_norm.split())
-    words2 = set(t2_norm.split())
-    intersection = len(words1.intersection(words2))
-    union = len(words1.union(words2))
+    # Word masks come from a simple split to avoid punctuation noise
+    intersection = (mask1 & mask2).bit_count()
+    union = (mask1 | mask2).bit_count()
     jaccard = intersection / union if union > 0 else 0.0
     
     # 2. Sequence Similarity (Character Order / Levenshtein-like)
-    sequence = SequenceMatcher(None, t1_norm, t2_norm).ratio()
+    if sequence is None:
+        if _Indel is not None:
+            sequence = _Indel.normalized_similarity(t1_norm, t2_norm)
+        else:
+            sequence = SequenceMatcher(None, t1_norm, t2_norm).ratio()
     
     # Weighted Average: 40% Jaccard, 60% Sequence
     # Sequence is usually better for titles as order matters ("Case for iPhone" vs "iPhone for Case")
     return (jaccard * 0.4) + (sequence * 0.6)
 
 
-def generate_title_diff(title1: str, title2: str) -> list[dict]:
+# Inputs longer than this (in characters) skip SequenceMatcher entirely: its
+# worst case is quadratic, and a whole-block replace is all a UI can show anyway.
+_MAX_DIFF_CHARS = 5000
+
+
+def _join_tokens(tokens: list[str]) -> str:
+    """Reassemble tokenize_title output, spacing words but not punctuation."""
+    # Tokens are either \w+ runs or a single punctuation char, so the first
+    # character alone decides which one we have.
+    return "".join([" " + t if t[0].isalnum() else t for t in tokens]).lstrip()
+
+
+def generate_title_diff(title1: str, title2: str) -> Iterator[DiffSpan]:
     """
     Generate a detailed token-level diff between two titles.
+    Yields spans in order; wrap in list() where the diff is stored.
     """
+    if title1 != title2 and max(len(title1), len(title2)) > _MAX_DIFF_CHARS:
+        for kind, text in (("delete", title1), ("insert", title2)):
+            if text.strip():
+                yield {"type": kind, "text": text.strip()}
+        return
+
     # Use advanced tokenization to separate punctuation
     a = tokenize_title(title1)
     b = tokenize_title(title2)
+
+    if a == b:
+        if a:
+            yield {"type": "equal", "text": _join_tokens(a)}
+        return
     
-    matcher = SequenceMatcher(None, a, b)
-    diff = []
+    matcher = SequenceMatcher(None, a, b, autojunk=True)
     
     for opcode, a0, a1, b0, b1 in matcher.get_opcodes():
         if opcode == 'equal':
-            diff.append({"type": "equal", "text": "".join([" " + t if t.isalnum() else t for t in a[a0:a1]]).strip()})
+            yield {"type": "equal", "text": _join_tokens(a[a0:a1])}
         elif opcode == 'insert':
-            diff.append({"type": "insert", "text": "".join([" " + t if t.isalnum() else t for t in b[b0:b1]]).strip()})
+            yield {"type": "insert", "text": _join_tokens(b[b0:b1])}
         elif opcode == 'delete':
-            diff.append({"type": "delete", "text": "".join([" " + t if t.isalnum() else t for t in a[a0:a1]]).strip()})
+            yield {"type": "delete", "text": _join_tokens(a[a0:a1])}
         elif opcode == 'replace':
-            diff.append({"type": "delete", "text": "".join([" " + t if t.isalnum() else t for t in a[a0:a1]]).strip()})
-            diff.append({"type": "insert", "text": "".join([" " + t if t.isalnum() else t for t in b[b0:b1]]).strip()})
-            
-    return diff
+            yield {"type": "delete", "text": _join_tokens(a[a0:a1])}
+            yield {"type": "insert", "text": _join_tokens(b[b0:b1])}
 
 
-def generate_description_diff(desc1: str, desc2: str) -> list[dict]:
+def generate_description_diff(desc1: str, desc2: str) -> list[DiffSpan]:
     """
     Generate a word-level diff between two descriptions.
     Uses word-level comparison for accurate highlighting of differences.
@@ -1194,36 +1406,59 @@ def get_region_url(region: str, asin: str) -> str:
     return f"https://{domain}/dp/{asin}"
 
 
+# Below this many titles, spinning up cdist's worker threads costs more than
+# scoring the whole matrix on the calling thread.
+_PARALLEL_MIN_TITLES = 32
+
+
+def _title_sequence_matrix(norms: list[str]):
+    """
+    Indel similarity for every pair of titles in one rapidfuzz call (C++,
+    GIL released, multi-threaded for large sets).  None without rapidfuzz.
+    """
+    if _rf_cdist is None:
+        return None
+    workers = -1 if len(norms) >= _PARALLEL_MIN_TITLES and (os.cpu_count() or 1) > 1 else 1
+    return _rf_cdist(norms, norms, scorer=_Indel.normalized_similarity, dtype=np.float64, workers=workers)
+
+
 def check_title_mismatch(titles: dict[str, str]) -> dict:
     """
     Check for title mismatches across regions.
     """
-    regions = list(titles.keys())
-    mismatches = []
+    mismatches: list[Mismatch] = []
     is_mismatch = False
+    # Lowercase / encode each title once rather than once per pair it appears in
+    norms = [title.lower() for title in titles.values()]
+    entries = list(zip(range(len(norms)), titles, titles.values(), norms, _word_masks(norms)))
+    sequences = _title_sequence_matrix(norms)
+    # Regions sharing a listing repeat the same title pair (US/CA vs DE, ...);
+    # score and diff each distinct pair only once.
+    pair_cache: dict[tuple[str, str], tuple[float, list[DiffSpan] | None]] = {}
     
-    for i in range(len(regions)):
-        for j in range(i + 1, len(regions)):
-            r1, r2 = regions[i], regions[j]
-            t1, t2 = titles[r1], titles[r2]
-            
+    for (i, r1, t1, n1, m1), (j, r2, t2, n2, m2) in combinations(entries, 2):
+        cached = pair_cache.get((t1, t2))
+        if cached is None:
             # Calculate robust similarity
-            similarity = calculate_title_similarity(t1, t2)
+            sequence = float(sequences[i, j]) if sequences is not None else None
+            similarity = _title_sim(n1, n2, m1, m2, sequence)
+            # Threshold for title mismatch (calibrated for translated titles)
+            diff = list(generate_title_diff(t1, t2)) if similarity < 0.70 else None
+            cached = pair_cache[(t1, t2)] = (similarity, diff)
+        similarity, diff = cached
+        
+        if diff is not None:
+            is_mismatch = True
+            
+            mismatches.append({
+                "region_1": r1,
+                "region_2": r2,
+                "title_1": t1,
+                "title_2": t2,
+                "similarity": round(similarity, 4),
+                "diff": diff
+            })
             
-            if similarity < 0.70:  # Threshold for title mismatch (calibrated for translated titles)
-                is_mismatch = True
-                # Generate diff
-                diff = generate_title_diff(t1, t2)
-                
-                mismatches.append({
-                    "region_1": r1,
-                    "region_2": r2,
-                    "title_1": t1,
-                    "title_2": t2,
-                    "similarity": round(similarity, 4),
-                    "diff": diff
-                })
-                
     return {
         "is_mismatch": is_mismatch,
         "titles": titles,
@@ -1232,6 +1467,19 @@ def check_title_mismatch(titles: dict[str, str]) -> dict:
 
 
 
+# ── Pair analysis ─────────────────────────────────────────────────
+def _analyse_pair(job: tuple) -> tuple[dict, list[DiffSpan]]:
+    """Detailed similarity + word-level diff for one (desc_1, desc_2, ...) job."""
+    desc_1, desc_2, profile1, profile2, tfidf_cosine = job
+    detailed = calculate_similarity_advanced(
+        desc_1, desc_2,
+        profile1=profile1,
+        profile2=profile2,
+        tfidf_cosine=tfidf_cosine,
+    )
+    return detailed, generate_description_diff(desc_1, desc_2)
+
+
 def calculate_pairwise_similarities(descriptions: dict[str, str], asin: str) -> tuple[list[dict], dict, list[dict]]:
     """
     Calculate similarity scores between all pairs of region descriptions.
@@ -1239,67 +1487,78 @@ def calculate_pairwise_similarities(descriptions: dict[str, str], asin: str) ->
 
     NEW: Runs the full 6-technique pipeline per pair and aggregates issues.
     """
-    regions = list(descriptions.keys())
+    regions = tuple(descriptions)
     comparisons = []
 
+    # Profile each region once (preprocessing, sentences, specs, ...) and fit
+    # TF-IDF once over the whole set, instead of re-doing both for every pair.
+    profiles = [text_profile(descriptions[r]) for r in regions]
+    tfidf_sim = tfidf_similarity_matrix([p['processed'] for p in profiles])
+
     # ── Global spec extraction (across ALL regions at once) ───────
-    specs_by_region = {r: SpecExtractor.extract(descriptions[r]) for r in regions}
+    specs_by_region = {r: p['specs'] for r, p in zip(regions, profiles)}
     global_spec_analysis = SpecExtractor.compare_across_regions(specs_by_region)
 
     all_issues: list[dict] = []
 
-    for i in range(len(regions)):
-        for j in range(i + 1, len(regions)):
-            region_1 = regions[i]
-            region_2 = regions[j]
-            desc_1 = descriptions[region_1]
-            desc_2 = descriptions[region_2]
-
-            # Full multi-dimensional analysis
-            detailed = calculate_similarity_advanced(desc_1, desc_2)
-
-            # Generate description diff (word-level)
-            desc_diff = generate_description_diff(desc_1, desc_2)
-
-            # Detect issues for this pair
-            pair_issues = IssueDetector.detect(
-                region_1, region_2, desc_1, desc_2,
-                global_spec_analysis,
-                detailed['sentence_detail'],
-                detailed['content_gaps'],
-                detailed['structural_detail'],
+    # Text-only analysis depends just on the two strings, so pairs with the
+    # same texts (e.g. US/CA sharing one listing) are only analysed once.
+    texts = tuple(descriptions[r] for r in regions)
+    pairs = list(combinations(range(len(regions)), 2))
+    jobs: dict[tuple[str, str], tuple] = {}
+    for i, j in pairs:
+        key = (texts[i], texts[j])
+        if key not in jobs:
+            jobs[key] = (
+                key[0], key[1], profiles[i], profiles[j],
+                float(tfidf_sim[i, j]) if tfidf_sim is not None else None,
             )
-            all_issues.extend(pair_issues)
-
-            comparisons.append({
-                "region_1": region_1,
-                "region_2": region_2,
-                "similarity_score": detailed['combined_score'],
-                # New per-dimension scores
-                "ngram_dice": detailed['ngram_dice'],
-                "bigram_jaccard": detailed['bigram_jaccard'],
-                "word_jaccard": detailed['word_jaccard'],
-                "sequence_score": detailed['sequence'],
-                "sentence_alignment": detailed['sentence_alignment'],
-                "feature_overlap": detailed['feature_overlap'],
-                "spec_match": detailed['spec_match'],
-                "structural_score": detailed['structural'],
-                "tfidf_score": detailed['tfidf_cosine'],
-                # Keep legacy field names for backward compat
-                "jaccard_score": detailed['word_jaccard'],
-                "confidence": detailed['confidence'],
-                "description_1": desc_1,
-                "description_2": desc_2,
-                "description_diff": desc_diff,
-                "url_1": get_region_url(region_1, asin),
-                "url_2": get_region_url(region_2, asin),
-                # Per-pair issues
-                "issues": pair_issues,
-                # Full sentence alignment for structured diff view
-                "sentence_detail": detailed['sentence_detail'],
-                # Content gaps
-                "content_gaps": detailed['content_gaps'],
-            })
+    pair_cache = {key: _analyse_pair(job) for key, job in jobs.items()}
+
+    for i, j in pairs:
+        region_1, region_2 = regions[i], regions[j]
+        desc_1, desc_2 = texts[i], texts[j]
+        detailed, desc_diff = pair_cache[(desc_1, desc_2)]
+
+        # Detect issues for this pair
+        pair_issues = IssueDetector.detect(
+            region_1, region_2, desc_1, desc_2,
+            global_spec_analysis,
+            detailed['sentence_detail'],
+            detailed['content_gaps'],
+            detailed['structural_detail'],
+        )
+        all_issues.extend(pair_issues)
+
+        comparisons.append({
+            "region_1": region_1,
+            "region_2": region_2,
+            "similarity_score": detailed['combined_score'],
+            # New per-dimension scores
+            "ngram_dice": detailed['ngram_dice'],
+            "bigram_jaccard": detailed['bigram_jaccard'],
+            "word_jaccard": detailed['word_jaccard'],
+            "sequence_score": detailed['sequence'],
+            "sentence_alignment": detailed['sentence_alignment'],
+            "feature_overlap": detailed['feature_overlap'],
+            "spec_match": detailed['spec_match'],
+            "structural_score": detailed['structural'],
+            "tfidf_score": detailed['tfidf_cosine'],
+            # Keep legacy field names for backward compat
+            "jaccard_score": detailed['word_jaccard'],
+            "confidence": detailed['confidence'],
+            "description_1": desc_1,
+            "description_2": desc_2,
+            "description_diff": desc_diff,
+            "url_1": get_region_url(region_1, asin),
+            "url_2": get_region_url(region_2, asin),
+            # Per-pair issues
+            "issues": pair_issues,
+            # Full sentence alignment for structured diff view
+            "sentence_detail": detailed['sentence_detail'],
+            # Content gaps
+            "content_gaps": detailed['content_gaps'],
+        })
 
     # De-duplicate global issues (same spec conflict may appear from multiple pairs)
     seen = set()
@@ -1327,6 +1586,28 @@ def calculate_pairwise_similarities(descriptions: dict[str, str], asin: str) ->
     return comparisons, global_spec_analysis, capped
 
 
+@functools.lru_cache(maxsize=64)
+def _risk_stats_fn(n: int):
+    """
+    Build a (mean, min) function specialised to exactly ``n`` comparisons.
+
+    The region count is fixed per deployment, so the generated straight-line
+    code (no generator, no per-item loop) is built once and reused.  The sum is
+    left-to-right, matching ``sum(...) / n``.
+    """
+    names = [f"s{k}" for k in range(n)]
+    lines = [f"    {name} = c[{k}]['similarity_score']" for k, name in enumerate(names)]
+    lowest = names[0] if n == 1 else f"min({', '.join(names)})"
+    src = (
+        "def risk_stats(c):\n"
+        + "\n".join(lines)
+        + f"\n    return ({' + '.join(names)}) / {n}, {lowest}\n"
+    )
+    namespace: dict = {}
+    exec(src, namespace)
+    return namespace["risk_stats"]
+
+
 def determine_risk_level(comparisons: list[dict]) -> RiskLevel:
     """
     Determine overall risk level based on comparison scores.
@@ -1342,8 +1623,7 @@ def determine_risk_level(comparisons: list[dict]) -> RiskLevel:
     if not comparisons:
         return "LOW"
     
-    avg_similarity = sum(c["similarity_score"] for c in comparisons) / len(comparisons)
-    min_similarity = min(c["similarity_score"] for c in comparisons)
+    avg_similarity, min_similarity = _risk_stats_fn(len(comparisons))(comparisons)
     
     # Count high-severity issues across all pairs
     total_high_issues = sum(len([i for i in c.get("issues", []) if i.get("severity") == "high"]) for c in comparisons)
@@ -1360,14 +1640,21 @@ def determine_risk_level(comparisons: list[dict]) -> RiskLevel:
         return "HIGH"
 
 
-async def generate_descriptions_from_page(page_description: str, page_region: str) -> dict[str, str]:
+async def generate_descriptions_from_page(
+    page_description: str,
+    page_region: str,
+    *,
+    fallbacks: set[str] | None = None,
+) -> dict[str, str]:
     """
     Generate per-region descriptions based on actual scraped content from the
     current Amazon page.  The current region gets the real text; English-speaking
     regions get locale-tweaked copies; non-English regions get Google-Translated
     versions so the translation pipeline is exercised realistically.
+
+    Non-English regions whose translation failed get the untranslated base
+    text; their codes are added to *fallbacks* when given.
     """
-    import asyncio
     base = page_description
     descriptions: dict[str, str] = {}
 
@@ -1398,9 +1685,9 @@ async def generate_descriptions_from_page(page_description: str, page_region: st
     async def _translate_for_region(region: str, lang: str):
         try:
             translated = await asyncio.to_thread(_translate_text, base, "en", lang)
-            return region, translated if translated else base
         except Exception:
-            return region, base
+            translated = None
+        return region, translated
 
     tasks = [
         _translate_for_region(r, l)
@@ -1410,17 +1697,24 @@ async def generate_descriptions_from_page(page_description: str, page_region: st
     if tasks:
         results = await asyncio.gather(*tasks)
         for region, text in results:
-            descriptions[region] = text
+            descriptions[region] = text if text else base
+            if not text and fallbacks is not None:
+                fallbacks.add(region)
 
     return descriptions
 
 
-async def generate_titles_from_page(page_title: str, page_region: str) -> dict[str, str]:
+async def generate_titles_from_page(
+    page_title: str,
+    page_region: str,
+    *,
+    fallbacks: set[str] | None = None,
+) -> dict[str, str]:
     """
     Generate per-region titles based on the actual scraped title.
-    Similar logic to generate_descriptions_from_page but for short titles.
+    Similar logic to generate_descriptions_from_page but for short titles
+    (including the *fallbacks* bookkeeping).
     """
-    import asyncio
     titles: dict[str, str] = {}
     titles[page_region] = page_title
 
@@ -1436,9 +1730,9 @@ async def generate_titles_from_page(page_title: str, page_region: str) -> dict[s
     async def _translate_title(region: str, lang: str):
         try:
             translated = await asyncio.to_thread(_translate_text, page_title, "en", lang)
-            return region, translated if translated else page_title
         except Exception:
-            return region, page_title
+            translated = None
+        return region, translated
 
     tasks = [
         _translate_title(r, l)
@@ -1448,11 +1742,31 @@ async def generate_titles_from_page(page_title: str, page_region: str) -> dict[s
     if tasks:
         results = await asyncio.gather(*tasks)
         for region, text in results:
-            titles[region] = text
+            titles[region] = text if text else page_title
+            if not text and fallbacks is not None:
+                fallbacks.add(region)
 
     return titles
 
 
+# ── Result memoisation ────────────────────────────────────────────
+# Mock data is deterministic per ASIN (and per page payload), so repeat
+# checks can be served from memory.  Results are large nested dicts, so the
+# LRU is kept modest; entries are handed out as deep copies because callers
+# enrich the returned dict in place.  Entries also expire after
+# _RESULT_TTL seconds so pollers such as /alerts/check eventually see fresh
+# data.
+_RESULT_CACHE_SIZE = 256
+_RESULT_TTL = 60.0
+_result_cache: OrderedDict[tuple, tuple[float, dict]] = OrderedDict()
+
+
+def invalidate_cached_results(asin: str) -> None:
+    """Drop every memoised result for *asin* (any page payload)."""
+    for key in [k for k in _result_cache if k[0] == asin]:
+        del _result_cache[key]
+
+
 async def check_description_consistency(
     asin: str,
     page_title: str | None = None,
@@ -1467,6 +1781,40 @@ async def check_description_consistency(
     If page_title / page_description / page_region are provided and the ASIN
     is not one of the hardcoded mock ASINs, the actual scraped content is used
     as the base for generating realistic per-region mock data.
+
+    Results are memoised per argument tuple (LRU with a TTL).  Runs where a
+    translation failed are not cached so a transient outage doesn't stick.
+    """
+    key = (asin, page_title, page_description, page_region)
+    entry = _result_cache.get(key)
+    if entry is not None:
+        expires, cached = entry
+        if time.monotonic() < expires:
+            _result_cache.move_to_end(key)
+            return copy.deepcopy(cached)
+        del _result_cache[key]
+
+    result, degraded = await _check_description_consistency(asin, page_title, page_description, page_region)
+    if degraded:
+        # Some translation fell back; serve it, but never from the cache
+        return result
+
+    _result_cache[key] = (time.monotonic() + _RESULT_TTL, result)
+    if len(_result_cache) > _RESULT_CACHE_SIZE:
+        _result_cache.popitem(last=False)
+    return copy.deepcopy(result)
+
+
+async def _check_description_consistency(
+    asin: str,
+    page_title: str | None,
+    page_description: str | None,
+    page_region: str | None,
+) -> dict:
+    """
+    Uncached body of check_description_consistency.  Returns (result,
+    degraded); degraded is True when any translation fell back to the
+    untranslated text, so the result must not be cached.
     """
     # Get descriptions for all regions
     use_page_data = (
@@ -1475,10 +1823,14 @@ async def check_description_consistency(
         and len(page_description) >= 30
         and asin not in MOCK_DESCRIPTIONS
     )
+    description_fallbacks: set[str] = set()
+    title_fallbacks: set[str] = set()
     if use_page_data:
-        descriptions = await generate_descriptions_from_page(page_description, page_region)
+        descriptions = await generate_descriptions_from_page(
+            page_description, page_region, fallbacks=description_fallbacks
+        )
     else:
-        descriptions = get_mock_descriptions(asin)
+        descriptions = dict(get_mock_descriptions(asin))
 
     # Get titles for all regions
     use_page_title = (
@@ -1488,12 +1840,16 @@ async def check_description_consistency(
         and asin not in MOCK_TITLES
     )
     if use_page_title:
-        titles = await generate_titles_from_page(page_title, page_region)
+        titles = await generate_titles_from_page(page_title, page_region, fallbacks=title_fallbacks)
     else:
-        titles = get_mock_titles(asin)
+        titles = dict(get_mock_titles(asin))
     
-    # ── Translate descriptions to English for fair comparison ─────
-    translation_results = await translate_descriptions(descriptions, target_lang="en")
+    # ── Translate descriptions and titles to English for fair comparison ──
+    # Independent network-bound batches, so both go out at once
+    translation_results, title_translation_results = await asyncio.gather(
+        translate_descriptions(descriptions, target_lang="en"),
+        translate_descriptions(titles, target_lang="en"),
+    )
     
     # Build translated descriptions dict for comparison
     translated_descriptions = {
@@ -1510,17 +1866,18 @@ async def check_description_consistency(
             "was_translated": info["was_translated"],
             "original_text": info["original"],
             "translated_text": info["translated"],
+            # Holds the English page text because localising it failed
+            "translation_fallback": region in description_fallbacks,
         }
     
-    # ── Translate titles to English for fair comparison ───────────
-    title_translation_results = await translate_descriptions(titles, target_lang="en")
     translated_titles = {
         region: info["translated"]
         for region, info in title_translation_results.items()
     }
     
-    # Check for title mismatches using translated titles
-    title_analysis = check_title_mismatch(translated_titles)
+    # Check for title mismatches using translated titles.  The scoring below is
+    # CPU-bound, so it runs in a worker thread to keep the event loop free.
+    title_analysis = await asyncio.to_thread(check_title_mismatch, translated_titles)
     # Also include original titles in the analysis
     title_analysis["original_titles"] = titles
     title_analysis["translated_titles"] = translated_titles
@@ -1530,11 +1887,14 @@ async def check_description_consistency(
             "detected_language": info["source_language"],
             "language_name": info["source_language_name"],
             "was_translated": info["was_translated"],
+            "translation_fallback": region in title_fallbacks,
         }
     title_analysis["language_info"] = title_language_info
     
     # Calculate pairwise similarities using TRANSLATED descriptions
-    comparisons, global_spec_analysis, global_issues = calculate_pairwise_similarities(translated_descriptions, asin)
+    comparisons, global_spec_analysis, global_issues = await asyncio.to_thread(
+        calculate_pairwise_similarities, translated_descriptions, asin
+    )
     
     # Enrich comparisons with original text + language info
     for comp in comparisons:
@@ -1566,10 +1926,11 @@ async def check_description_consistency(
             risk_level = "HIGH"
     
     # Calculate statistics
-    similarity_scores = [c["similarity_score"] for c in comparisons]
-    avg_similarity = sum(similarity_scores) / len(similarity_scores) if similarity_scores else 1.0
-    min_similarity = min(similarity_scores) if similarity_scores else 1.0
-    max_similarity = max(similarity_scores) if similarity_scores else 1.0
+    if comparisons:
+        scores = np.fromiter((c["similarity_score"] for c in comparisons), dtype=np.float64, count=len(comparisons))
+        avg_similarity, min_similarity, max_similarity = float(scores.mean()), float(scores.min()), float(scores.max())
+    else:
+        avg_similarity = min_similarity = max_similarity = 1.0
     
     # Determine overall confidence
     confidences = [c["confidence"] for c in comparisons]
@@ -1582,8 +1943,16 @@ async def check_description_consistency(
     
     # Build region URLs map
     region_urls = {region: get_region_url(region, asin) for region in descriptions.keys()}
-    
-    return {
+
+    # Any region compared on untranslated text: localising page data failed,
+    # or translating a non-English text to English did
+    degraded = bool(description_fallbacks or title_fallbacks) or any(
+        info["source_language"] != "en" and not info["was_translated"]
+        for results in (translation_results, title_translation_results)
+        for info in results.values()
+    )
+
+    result = {
         "asin": asin,
         "risk_level": risk_level,
         "average_similarity": round(avg_similarity, 4),
@@ -1607,3 +1976,4 @@ async def check_description_consistency(
             "total": len(global_issues),
         },
     }
+    return result, degraded
@@ -6,22 +6,37 @@ price comparison, image comparison, and notification alerts.
 
 import asyncio
 import csv
+import functools
+import hashlib
 import io
-import json
+import logging
 import os
-import time
+import sys
+from contextlib import asynccontextmanager
 from datetime import datetime
+from itertools import combinations
 from typing import Literal, Optional
 
+import orjson
 import uvicorn
 from fastapi import FastAPI, Query, HTTPException, Body
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import StreamingResponse
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import ORJSONResponse, StreamingResponse
 from pydantic import BaseModel
+from starlette.concurrency import run_in_threadpool
+
+try:
+    # Non-cryptographic 64-bit hash; change detection doesn't need SHA
+    from xxhash import xxh3_64 as _desc_hasher
+except ImportError:
+    _desc_hasher = functools.partial(hashlib.blake2b, digest_size=8)
 
-from compare import check_description_consistency
+from compare import check_description_consistency, invalidate_cached_results
 from scraper import (
     scrape_all_regions,
+    get_http_client,
+    close_http_client,
     REGION_DOMAINS,
     REGION_CURRENCIES,
     CURRENCY_SYMBOLS,
@@ -30,13 +45,48 @@ from scraper import (
     get_price_display,
 )
 
+logger = logging.getLogger("mrcc")
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Open the scraper's shared pooled client up front; close it on shutdown
+    get_http_client()
+    try:
+        yield
+    finally:
+        await close_http_client()
+
+
+# In-flight scrapes by ASIN, so /check, /prices and /images fanning out for
+# the same product share one scrape (finished results live in the scraper cache)
+_inflight_scrapes: dict[str, asyncio.Task] = {}
+
+
+async def _scrape_once(asin: str) -> dict[str, dict]:
+    task = _inflight_scrapes.get(asin)
+    if task is None:
+        task = asyncio.create_task(scrape_all_regions(asin))
+        _inflight_scrapes[asin] = task
+        task.add_done_callback(lambda _: _inflight_scrapes.pop(asin, None))
+    # Shielded: one caller's wait_for timeout must not cancel the shared scrape
+    return await asyncio.shield(task)
+
+
 # Initialize FastAPI app
 app = FastAPI(
     title="Multi-Region Description Consistency Checker",
     description="API for comparing product descriptions, prices, and images across Amazon regions",
     version="2.0.0",
+    # orjson encodes the large nested /check payloads several times faster
+    default_response_class=ORJSONResponse,
+    lifespan=lifespan,
 )
 
+# /check payloads carry full descriptions, translations and diffs — tens of
+# KB of very compressible text. Added first so CORS stays the outermost layer.
+app.add_middleware(GZipMiddleware, minimum_size=1024, compresslevel=5)
+
 app.add_middleware(
     CORSMiddleware,
     allow_origins=["*"],
@@ -191,28 +241,66 @@ class AlertStatus(BaseModel):
 
 # ── Helper: image comparison ────────────────────────────────────────
 
+def _image_bitmaps(images_by_region: dict[str, list[str]]) -> dict[str, int]:
+    """Pack each region's image URLs into an int bitmap over a shared URL index."""
+    index: dict[str, int] = {}
+    bitmaps = {}
+    for region, imgs in images_by_region.items():
+        bits = 0
+        for url in imgs:
+            bits |= 1 << index.setdefault(url, len(index))
+        bitmaps[region] = bits
+    return bitmaps
+
+
 def _compare_image_sets(images_by_region: dict[str, list[str]]) -> list[dict]:
     """Compare image sets between all region pairs."""
-    regions = list(images_by_region.keys())
-    pairs = []
-    for i in range(len(regions)):
-        for j in range(i + 1, len(regions)):
-            r1, r2 = regions[i], regions[j]
-            imgs1 = set(images_by_region.get(r1, []))
-            imgs2 = set(images_by_region.get(r2, []))
-            common = imgs1 & imgs2
-            union = imgs1 | imgs2
-            sim = (len(common) / len(union) * 100) if union else 100.0
-            pairs.append({
-                "region_1": r1,
-                "region_2": r2,
-                "count_match": len(imgs1) == len(imgs2),
-                "count_1": len(imgs1),
-                "count_2": len(imgs2),
-                "common_images": len(common),
-                "similarity_pct": round(sim, 1),
-            })
-    return pairs
+    # One bitmap per region: intersection is a single AND + popcount rather
+    # than hashing every URL again per pair; union follows from cardinalities
+    bitmaps = _image_bitmaps(images_by_region)
+    sizes = {r: b.bit_count() for r, b in bitmaps.items()}
+
+    def pair(r1: str, r2: str) -> dict:
+        sz1, sz2 = sizes[r1], sizes[r2]
+        common = (bitmaps[r1] & bitmaps[r2]).bit_count()
+        union = sz1 + sz2 - common
+        sim = (common / union * 100) if union else 100.0
+        return {
+            "region_1": r1,
+            "region_2": r2,
+            "count_match": sz1 == sz2,
+            "count_1": sz1,
+            "count_2": sz2,
+            "common_images": common,
+            "similarity_pct": round(sim, 1),
+        }
+
+    return [pair(r1, r2) for r1, r2 in combinations(bitmaps, 2)]
+
+
+# ── Helper: streaming CSV ───────────────────────────────────────────
+
+class _CSVRowWriter:
+    """csv.writer over a reusable buffer that hands back one encoded row at a time."""
+
+    def __init__(self):
+        self._buf = io.StringIO()
+        self._writer = csv.writer(self._buf)
+
+    def row(self, values: list) -> str:
+        self._writer.writerow(values)
+        return self._drain()
+
+    def rows(self, rows) -> str:
+        """Encode a whole table in one writerows call (one chunk, no per-row overhead)."""
+        self._writer.writerows(rows)
+        return self._drain()
+
+    def _drain(self) -> str:
+        text = self._buf.getvalue()
+        self._buf.seek(0)
+        self._buf.truncate()
+        return text
 
 
 # ── API Endpoints ───────────────────────────────────────────────────
@@ -235,6 +323,10 @@ class PageCheckRequest(BaseModel):
     page_region: Optional[str] = None
 
 
+# /check keeps response_model for the OpenAPI schema, but _do_check already
+# builds exactly that shape, so the handlers return an ORJSONResponse directly
+# and skip FastAPI's per-request validate + dump pass over the wide model.
+
 @app.post("/check", response_model=CheckResponse)
 async def check_consistency_post(body: PageCheckRequest):
     """
@@ -242,13 +334,13 @@ async def check_consistency_post(body: PageCheckRequest):
     Uses the actual product title/description for unknown ASINs instead
     of random mock categories.
     """
-    return await _do_check(
+    return ORJSONResponse(await _do_check(
         asin=body.asin,
         scrape=body.scrape,
         page_title=body.page_title,
         page_description=body.page_description,
         page_region=body.page_region,
-    )
+    ))
 
 
 @app.get("/check", response_model=CheckResponse)
@@ -259,7 +351,7 @@ async def check_consistency(
     """
     GET variant — kept for backward compatibility (test.html, etc.).
     """
-    return await _do_check(asin=asin, scrape=scrape)
+    return ORJSONResponse(await _do_check(asin=asin, scrape=scrape))
 
 
 async def _do_check(
@@ -281,13 +373,13 @@ async def _do_check(
 
         if scrape:
             try:
-                scraped_data = await scrape_all_regions(asin.upper())
+                scraped_data = await _scrape_once(asin.upper())
                 # Check if we got meaningful data from at least 2 regions
                 valid = {r: d for r, d in scraped_data.items() if d.get("scraped") and d.get("description")}
                 if len(valid) >= 2:
                     scraped = True
             except Exception as e:
-                print(f"[WARN] Scraping failed for {asin}: {e}")
+                logger.warning("Scraping failed for %s: %s", asin, e)
 
         if scraped and scraped_data:
             # Build descriptions & titles from scraped data
@@ -326,17 +418,19 @@ async def _do_check(
             # Fallback any missing regions to mock
             if len(descriptions) < 9:
                 from compare import get_mock_descriptions, get_mock_titles
-                mock_descs = get_mock_descriptions(asin.upper())
-                mock_titles = get_mock_titles(asin.upper())
-                for r in REGION_DOMAINS:
-                    if r not in descriptions:
-                        descriptions[r] = mock_descs.get(r, "")
-                    if r not in titles:
-                        titles[r] = mock_titles.get(r, "")
+                mock_desc = get_mock_descriptions(asin.upper()).get
+                mock_title = get_mock_titles(asin.upper()).get
+                for r in [r for r in REGION_DOMAINS if r not in descriptions or r not in titles]:
+                    descriptions.setdefault(r, mock_desc(r, ""))
+                    titles.setdefault(r, mock_title(r, ""))
 
             # ── Translate scraped descriptions before comparison ──
+            # Descriptions and titles are independent network-bound batches
             from translator import translate_descriptions as _translate
-            translation_results = await _translate(descriptions, target_lang="en")
+            translation_results, title_translation_results = await asyncio.gather(
+                _translate(descriptions, target_lang="en"),
+                _translate(titles, target_lang="en"),
+            )
             translated_descriptions = {r: info["translated"] for r, info in translation_results.items()}
             language_info = {}
             for region, info in translation_results.items():
@@ -348,28 +442,28 @@ async def _do_check(
                     "translated_text": info["translated"],
                 }
 
-            # Translate titles
-            title_translation_results = await _translate(titles, target_lang="en")
             translated_titles = {r: info["translated"] for r, info in title_translation_results.items()}
 
             # Compare using translated text
-            comparisons = calculate_pairwise_similarities(translated_descriptions, asin.upper())
+            # CPU-bound scoring goes to the threadpool so other requests keep flowing
+            comparisons, _, _ = await run_in_threadpool(calculate_pairwise_similarities, translated_descriptions, asin.upper())
             risk_level = determine_risk_level(comparisons)
-            title_analysis = check_title_mismatch(translated_titles)
+            title_analysis = await run_in_threadpool(check_title_mismatch, translated_titles)
             title_analysis["original_titles"] = titles
             title_analysis["translated_titles"] = translated_titles
 
             # Enrich comparisons with original + language info
+            lang_tuple = {
+                r: (info["detected_language"], info["language_name"], info["was_translated"])
+                for r, info in language_info.items()
+            }
+            default_lang = ("en", "English", False)
             for comp in comparisons:
                 r1, r2 = comp["region_1"], comp["region_2"]
                 comp["original_description_1"] = descriptions.get(r1, "")
                 comp["original_description_2"] = descriptions.get(r2, "")
-                comp["language_1"] = language_info.get(r1, {}).get("detected_language", "en")
-                comp["language_2"] = language_info.get(r2, {}).get("detected_language", "en")
-                comp["language_name_1"] = language_info.get(r1, {}).get("language_name", "English")
-                comp["language_name_2"] = language_info.get(r2, {}).get("language_name", "English")
-                comp["was_translated_1"] = language_info.get(r1, {}).get("was_translated", False)
-                comp["was_translated_2"] = language_info.get(r2, {}).get("was_translated", False)
+                comp["language_1"], comp["language_name_1"], comp["was_translated_1"] = lang_tuple.get(r1, default_lang)
+                comp["language_2"], comp["language_name_2"], comp["was_translated_2"] = lang_tuple.get(r2, default_lang)
 
             if title_analysis["is_mismatch"] and risk_level == "LOW":
                 risk_level = "MEDIUM"
@@ -430,48 +524,47 @@ async def export_csv(
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
-    output = io.StringIO()
-    writer = csv.writer(output)
-
-    # Header
-    writer.writerow(["Multi-Region Description Consistency Report"])
-    writer.writerow(["ASIN", result["asin"]])
-    writer.writerow(["Risk Level", result["risk_level"]])
-    writer.writerow(["Average Similarity", f"{result['average_similarity']:.4f}"])
-    writer.writerow(["Regions Analyzed", ", ".join(result["regions_analyzed"])])
-    writer.writerow(["Generated", datetime.utcnow().isoformat()])
-    writer.writerow([])
-
-    # Comparisons
-    writer.writerow(["Region 1", "Region 2", "Similarity %", "TF-IDF", "Jaccard", "Sequence", "Feature Overlap", "Confidence"])
-    for c in result["comparisons"]:
-        writer.writerow([
-            c["region_1"], c["region_2"],
-            f"{c['similarity_score'] * 100:.1f}%",
-            f"{c.get('tfidf_score', 0) * 100:.1f}%",
-            f"{c.get('jaccard_score', 0) * 100:.1f}%",
-            f"{c.get('sequence_score', 0) * 100:.1f}%",
-            f"{c.get('feature_overlap', 0) * 100:.1f}%",
-            c.get("confidence", ""),
-        ])
-
-    writer.writerow([])
-    writer.writerow(["Region Descriptions"])
-    writer.writerow(["Region", "Description"])
-    for region, desc in result.get("descriptions", {}).items():
-        writer.writerow([region, desc])
-
-    # Title analysis
-    if result.get("title_analysis"):
-        writer.writerow([])
-        writer.writerow(["Title Analysis"])
-        writer.writerow(["Mismatch Detected", result["title_analysis"]["is_mismatch"]])
-        for region, title in result["title_analysis"].get("titles", {}).items():
-            writer.writerow([region, title])
-
-    output.seek(0)
+    async def gen():
+        writer = _CSVRowWriter()
+
+        # Header
+        yield writer.row(["Multi-Region Description Consistency Report"])
+        yield writer.row(["ASIN", result["asin"]])
+        yield writer.row(["Risk Level", result["risk_level"]])
+        yield writer.row(["Average Similarity", f"{result['average_similarity']:.4f}"])
+        yield writer.row(["Regions Analyzed", ", ".join(result["regions_analyzed"])])
+        yield writer.row(["Generated", datetime.utcnow().isoformat()])
+        yield writer.row([])
+
+        # Comparisons
+        yield writer.row(["Region 1", "Region 2", "Similarity %", "TF-IDF", "Jaccard", "Sequence", "Feature Overlap", "Confidence"])
+        yield writer.rows(
+            (
+                c["region_1"], c["region_2"],
+                f"{c['similarity_score'] * 100:.1f}%",
+                f"{c.get('tfidf_score', 0) * 100:.1f}%",
+                f"{c.get('jaccard_score', 0) * 100:.1f}%",
+                f"{c.get('sequence_score', 0) * 100:.1f}%",
+                f"{c.get('feature_overlap', 0) * 100:.1f}%",
+                c.get("confidence", ""),
+            )
+            for c in result["comparisons"]
+        )
+
+        yield writer.row([])
+        yield writer.row(["Region Descriptions"])
+        yield writer.row(["Region", "Description"])
+        yield writer.rows(result.get("descriptions", {}).items())
+
+        # Title analysis
+        if result.get("title_analysis"):
+            yield writer.row([])
+            yield writer.row(["Title Analysis"])
+            yield writer.row(["Mismatch Detected", result["title_analysis"]["is_mismatch"]])
+            yield writer.rows(result["title_analysis"].get("titles", {}).items())
+
     return StreamingResponse(
-        iter([output.getvalue()]),
+        gen(),
         media_type="text/csv",
         headers={"Content-Disposition": f"attachment; filename=mrcc_report_{asin}.csv"},
     )
@@ -489,7 +582,7 @@ async def export_json(
 
     result["exported_at"] = datetime.utcnow().isoformat()
 
-    output = json.dumps(result, indent=2, ensure_ascii=False)
+    output = orjson.dumps(result, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS)
     return StreamingResponse(
         iter([output]),
         media_type="application/json",
@@ -505,7 +598,7 @@ async def price_comparison(
 ):
     """Get price comparison across all Amazon regions (requires scraping)."""
     try:
-        scraped = await asyncio.wait_for(scrape_all_regions(asin.upper()), timeout=30)
+        scraped = await asyncio.wait_for(_scrape_once(asin.upper()), timeout=30)
     except asyncio.TimeoutError:
         return {
             "asin": asin.upper(), "prices": [], "cheapest_region": None,
@@ -558,7 +651,7 @@ async def image_comparison(
 ):
     """Compare product images across all regions (requires scraping)."""
     try:
-        scraped = await asyncio.wait_for(scrape_all_regions(asin.upper()), timeout=30)
+        scraped = await asyncio.wait_for(_scrape_once(asin.upper()), timeout=30)
     except asyncio.TimeoutError:
         return {
             "asin": asin.upper(), "images": [], "comparisons": [],
@@ -593,6 +686,32 @@ async def image_comparison(
 
 # ── Feature 5: Bulk ASIN Check ──────────────────────────────────────
 
+# Upper bound on ASINs checked concurrently by a single bulk request
+_BULK_CONCURRENCY = 10
+
+
+def _schedule_bulk_checks(asins: list[str]) -> list[asyncio.Task | None]:
+    """
+    Start a consistency check for every well-formed ASIN, at most
+    _BULK_CONCURRENCY at a time. Returns one task per input (None for
+    malformed ASINs); each task resolves to (result, error).
+    """
+    sem = asyncio.Semaphore(_BULK_CONCURRENCY)
+
+    async def one(asin: str) -> tuple[dict | None, str | None]:
+        async with sem:
+            try:
+                return await check_description_consistency(asin), None
+            except Exception as e:
+                return None, str(e)
+
+    tasks: list[asyncio.Task | None] = []
+    for asin_raw in asins:
+        asin = asin_raw.strip().upper()
+        tasks.append(asyncio.create_task(one(asin)) if asin and len(asin) == 10 else None)
+    return tasks
+
+
 @app.post("/bulk-check")
 async def bulk_check(body: BulkCheckRequest):
     """
@@ -602,10 +721,13 @@ async def bulk_check(body: BulkCheckRequest):
     if len(body.asins) > 50:
         raise HTTPException(status_code=400, detail="Maximum 50 ASINs per request")
 
+    tasks = _schedule_bulk_checks(body.asins)
+    outcomes = await asyncio.gather(*(t for t in tasks if t is not None))
+    done = iter(outcomes)
+
     results = []
-    for asin_raw in body.asins:
-        asin = asin_raw.strip().upper()
-        if not asin or len(asin) != 10:
+    for asin_raw, task in zip(body.asins, tasks):
+        if task is None:
             results.append({
                 "asin": asin_raw,
                 "risk_level": "UNKNOWN",
@@ -615,8 +737,8 @@ async def bulk_check(body: BulkCheckRequest):
                 "error": "Invalid ASIN format",
             })
             continue
-        try:
-            r = await check_description_consistency(asin)
+        r, error = next(done)
+        if r is not None:
             results.append({
                 "asin": r["asin"],
                 "risk_level": r["risk_level"],
@@ -625,14 +747,14 @@ async def bulk_check(body: BulkCheckRequest):
                 "confidence": r.get("confidence"),
                 "error": None,
             })
-        except Exception as e:
+        else:
             results.append({
-                "asin": asin,
+                "asin": asin_raw.strip().upper(),
                 "risk_level": "UNKNOWN",
                 "average_similarity": 0,
                 "regions_analyzed": [],
                 "confidence": None,
-                "error": str(e),
+                "error": error,
             })
 
     return {"results": results, "total": len(results)}
@@ -644,30 +766,37 @@ async def bulk_check_csv(body: BulkCheckRequest):
     if len(body.asins) > 50:
         raise HTTPException(status_code=400, detail="Maximum 50 ASINs per request")
 
-    output = io.StringIO()
-    writer = csv.writer(output)
-    writer.writerow(["ASIN", "Risk Level", "Avg Similarity %", "Confidence", "Regions", "Error"])
+    # Checks run concurrently; rows go out in request order as soon as
+    # every earlier ASIN has finished instead of after the whole batch
+    async def gen():
+        writer = _CSVRowWriter()
+        yield writer.row(["ASIN", "Risk Level", "Avg Similarity %", "Confidence", "Regions", "Error"])
 
-    for asin_raw in body.asins:
-        asin = asin_raw.strip().upper()
-        if not asin or len(asin) != 10:
-            writer.writerow([asin_raw, "UNKNOWN", "", "", "", "Invalid ASIN"])
-            continue
+        tasks = _schedule_bulk_checks(body.asins)
         try:
-            r = await check_description_consistency(asin)
-            writer.writerow([
-                r["asin"], r["risk_level"],
-                f"{r['average_similarity'] * 100:.1f}%",
-                r.get("confidence", ""),
-                ", ".join(r["regions_analyzed"]),
-                "",
-            ])
-        except Exception as e:
-            writer.writerow([asin, "UNKNOWN", "", "", "", str(e)])
-
-    output.seek(0)
+            for asin_raw, task in zip(body.asins, tasks):
+                if task is None:
+                    yield writer.row([asin_raw, "UNKNOWN", "", "", "", "Invalid ASIN"])
+                    continue
+                r, error = await task
+                if r is not None:
+                    yield writer.row([
+                        r["asin"], r["risk_level"],
+                        f"{r['average_similarity'] * 100:.1f}%",
+                        r.get("confidence", ""),
+                        ", ".join(r["regions_analyzed"]),
+                        "",
+                    ])
+                else:
+                    yield writer.row([asin_raw.strip().upper(), "UNKNOWN", "", "", "", error])
+        finally:
+            # Client went away mid-stream: don't leave checks running
+            for task in tasks:
+                if task is not None:
+                    task.cancel()
+
     return StreamingResponse(
-        iter([output.getvalue()]),
+        gen(),
         media_type="text/csv",
         headers={"Content-Disposition": "attachment; filename=mrcc_bulk_report.csv"},
     )
@@ -675,10 +804,13 @@ async def bulk_check_csv(body: BulkCheckRequest):
 
 # ── Feature 6: Notification Alerts ──────────────────────────────────
 
+# Upper bound on subscribed ASINs re-checked concurrently by /alerts/check
+_ALERT_CONCURRENCY = 8
+
 def _hash_descriptions(descriptions: dict[str, str]) -> str:
     """Create a hash of all region descriptions for change detection."""
-    combined = json.dumps(descriptions, sort_keys=True)
-    return hashlib.sha256(combined.encode()).hexdigest()[:16]
+    combined = orjson.dumps(descriptions, option=orjson.OPT_SORT_KEYS)
+    return _desc_hasher(combined).hexdigest()
 
 
 @app.post("/alerts/subscribe")
@@ -691,6 +823,9 @@ async def subscribe_alert(body: AlertSubscription):
     # Get current descriptions and hash them
     result = await check_description_consistency(asin)
     desc_hash = _hash_descriptions(result.get("descriptions", {}))
+    previous = _alert_store.get(asin)
+    if previous is not None and previous.get("last_hash") != desc_hash:
+        invalidate_cached_results(asin)
 
     _alert_store[asin] = {
         "last_hash": desc_hash,
@@ -739,23 +874,35 @@ async def check_alerts():
     Check all subscribed ASINs for description changes.
     Returns list of ASINs that have changed since last check.
     """
-    changed = []
-    for asin, data in _alert_store.items():
-        try:
-            result = await check_description_consistency(asin)
-            new_hash = _hash_descriptions(result.get("descriptions", {}))
-            if new_hash != data.get("last_hash"):
-                changed.append({
-                    "asin": asin,
-                    "old_hash": data["last_hash"],
-                    "new_hash": new_hash,
-                    "risk_level": result["risk_level"],
-                    "average_similarity": result["average_similarity"],
-                })
-                data["last_hash"] = new_hash
-            data["last_checked"] = datetime.utcnow().isoformat()
-        except Exception as e:
-            changed.append({"asin": asin, "error": str(e)})
+    sem = asyncio.Semaphore(_ALERT_CONCURRENCY)
+
+    async def check_one(asin: str, data: dict) -> dict | None:
+        async with sem:
+            try:
+                result = await check_description_consistency(asin)
+            except Exception as e:
+                return {"asin": asin, "error": str(e)}
+        # No await between reading and updating last_hash, so overlapping
+        # scans can't interleave here
+        new_hash = _hash_descriptions(result.get("descriptions", {}))
+        change = None
+        if new_hash != data.get("last_hash"):
+            change = {
+                "asin": asin,
+                "old_hash": data["last_hash"],
+                "new_hash": new_hash,
+                "risk_level": result["risk_level"],
+                "average_similarity": result["average_similarity"],
+            }
+            data["last_hash"] = new_hash
+            # Descriptions moved on: drop cached analyses (incl. page-payload variants)
+            invalidate_cached_results(asin)
+        data["last_checked"] = datetime.utcnow().isoformat()
+        return change
+
+    # Snapshot: subscribe/unsubscribe may mutate the store while checks await
+    outcomes = await asyncio.gather(*(check_one(a, d) for a, d in list(_alert_store.items())))
+    changed = [c for c in outcomes if c is not None]
 
     return {"changed": changed, "total_monitored": len(_alert_store)}
 
@@ -776,42 +923,47 @@ async def list_sample_asins():
     }
 
 
-import hashlib
-
 if __name__ == "__main__":
     import socket
 
+    # MRCC_LOG_LEVEL=WARNING (or ERROR) quietens the app/scraper/translator loggers
+    logging.basicConfig(
+        level=os.environ.get("MRCC_LOG_LEVEL", "INFO").upper(),
+        format="[%(levelname)s] %(name)s: %(message)s",
+    )
+
     def _port_free(p: int) -> bool:
         with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as s:
+            # Same options uvicorn binds with, so TIME_WAIT leftovers from a
+            # just-stopped server don't count as busy
+            s.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+            if hasattr(socket, "SO_REUSEPORT"):
+                s.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEPORT, 1)
             try:
                 s.bind(("0.0.0.0", p))
                 return True
             except OSError:
                 return False
 
-    port = int(os.environ.get("PORT", 5000))
-    if not _port_free(port):
-        # Try to kill the old process on that port, then retry
-        try:
-            import subprocess
-            result = subprocess.run(
-                ["netstat", "-ano"],
-                capture_output=True, text=True
-            )
-            for line in result.stdout.splitlines():
-                if f":{port}" in line and "LISTENING" in line:
-                    pid = line.strip().split()[-1]
-                    subprocess.run(["taskkill", "/PID", pid, "/F"],
-                                   capture_output=True)
-                    print(f"[INFO] Killed old process PID {pid} on port {port}")
-                    import time; time.sleep(1)
-                    break
-        except Exception:
-            pass
-        # If still not free, try next port
-        if not _port_free(port):
-            port += 1
-            print(f"[INFO] Port {port - 1} busy, using port {port}")
-
-    print(f"[INFO] Starting server on port {port}")
-    uvicorn.run(app, host="0.0.0.0", port=port)
+    # Busy port (e.g. an old server still running): move on to the next one.
+    # For multi-core production run `gunicorn -k uvicorn.workers.UvicornWorker -w N main:app`.
+    requested = int(os.environ.get("PORT", 5000))
+    for port in range(requested, requested + 10):
+        if _port_free(port):
+            break
+    else:
+        logger.error("No free port in %d-%d", requested, requested + 9)
+        sys.exit(1)
+    if port != requested:
+        logger.info("Port %d busy, using port %d", requested, port)
+
+    logger.info("Starting server on port %d", port)
+    uvicorn.run(
+        app,
+        host="0.0.0.0",
+        port=port,
+        # uvloop has no Windows build; uvicorn[standard] ships both elsewhere
+        loop="asyncio" if sys.platform == "win32" else "uvloop",
+        http="httptools",
+        access_log=False,
+    )
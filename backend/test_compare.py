@@ -1,6 +1,9 @@
 """Quick smoke test for the v3 comparison engine."""
 import asyncio
-from compare import check_description_consistency
+import re
+import compare
+import translator
+from compare import check_description_consistency, MOCK_DESCRIPTIONS, TextPreprocessor
 
 
 async def main():
@@ -60,6 +63,70 @@ async def main():
     for iss in r4["issues"][:5]:
         print(f"  [{iss['severity']}] {iss['title']}: {iss['description'][:60]}")
 
+    print()
+    print("=" * 60)
+    print("TEST 5: extract_numeric_specs matches the original four searches")
+    print("=" * 60)
+
+    def reference_specs(text):
+        specs = {}
+        text_lower = text.lower()
+        battery_match = re.search(r'(\d+)\s*(?:hour|hr|h)\s*(?:battery|playback|listening)?', text_lower)
+        if battery_match:
+            specs['battery_hours'] = int(battery_match.group(1))
+        weight_match = re.search(r'(\d+\.?\d*)\s*(?:oz|ounce|g|gram|kg|lb|pound)', text_lower)
+        if weight_match:
+            specs['weight'] = float(weight_match.group(1))
+        capacity_match = re.search(r'(\d+)\s*(?:oz|ml|l|liter|litre)', text_lower)
+        if capacity_match:
+            specs['capacity'] = int(capacity_match.group(1))
+        screen_match = re.search(r'(\d+\.?\d*)\s*(?:inch|in)', text_lower)
+        if screen_match:
+            specs['screen_size'] = float(screen_match.group(1))
+        return specs
+
+    samples = [d for regions in MOCK_DESCRIPTIONS.values() for d in regions.values()]
+    samples += [
+        "Holds 16 oz, 30 hours playback",        # oz is both weight and capacity
+        "6.1in screen, 250g, 2 headphones",       # units without word boundaries
+        "1.5 L bottle weighing 12 ounces", "",
+    ]
+    for text in samples:
+        got, want = TextPreprocessor.extract_numeric_specs(text), reference_specs(text)
+        assert got == want, f"{text[:40]!r}: {got} != {want}"
+    print(f"  {len(samples)} texts, e.g. {TextPreprocessor.extract_numeric_specs(samples[-4])}")
+
+    print()
+    print("=" * 60)
+    print("TEST 6: page data whose localisation failed is flagged, not cached")
+    print("=" * 60)
+    # en -> xx fails, xx -> en "succeeds" (echoes the text): the non-English
+    # regions end up holding English page text that otherwise looks fine
+    real_translate = translator._translate_text
+    translator._translate_text = lambda text, src, tgt="en": None if src == "en" else text
+    try:
+        args = ("B0DFALLBK1", "OnePlus Nord 5 5G (12GB RAM, 256GB)", r4["descriptions"]["IN"], "IN")
+        r6 = await check_description_consistency(*args)
+    finally:
+        translator._translate_text = real_translate
+    flagged = sorted(r for r, info in r6["language_info"].items() if info["translation_fallback"])
+    print(f"Fallback regions: {flagged}")
+    assert flagged == ["DE", "ES", "FR", "JP"]
+    assert r6["title_analysis"]["language_info"]["DE"]["translation_fallback"]
+    assert args not in compare._result_cache
+
+    # Cache side: a run whose xx -> en translations failed is served but not
+    # stored; the same inputs with working translation are
+    for stub, cached in ((lambda text, src, tgt="en": None, False), (lambda text, src, tgt="en": text, True)):
+        compare.invalidate_cached_results("B08N5WRWNW")
+        translator._translate_text = stub
+        try:
+            await check_description_consistency("B08N5WRWNW")
+        finally:
+            translator._translate_text = real_translate
+        assert (("B08N5WRWNW", None, None, None) in compare._result_cache) is cached
+    print("Degraded run bypassed the cache; clean run cached")
+
     print("\n✅ All tests passed!")
 
 
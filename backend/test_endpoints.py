@@ -48,3 +48,37 @@ for path, body in post_endpoints:
         print(f"FAIL {e.code}  POST {path}  ({e.reason})")
     except Exception as e:
         print(f"ERR       POST {path}  ({e})")
+
+
+# scrape=true /check, in-process with the scraper stubbed out. This used to
+# return 500: the (comparisons, spec, issues) tuple was iterated as if it
+# were the comparisons list.
+from fastapi.testclient import TestClient
+import main
+from compare import get_mock_descriptions, get_mock_titles
+
+
+async def _fake_scrape_all_regions(asin, client=None):
+    descs, titles = get_mock_descriptions(asin), get_mock_titles(asin)
+    return {
+        region: {
+            "title": titles.get(region, ""), "description": descs.get(region, ""),
+            "price": "10", "price_numeric": 10.0, "currency": currency,
+            "images": [f"https://m.media-amazon.com/images/I/{region}.jpg"], "scraped": True,
+        }
+        for region, currency in main.REGION_CURRENCIES.items()
+    }
+
+
+main.scrape_all_regions = _fake_scrape_all_regions
+with TestClient(main.app) as client:
+    path = "/check?asin=B08N5WRWNW&scrape=true"
+    resp = client.get(path)
+    body = resp.json() if resp.status_code == 200 else {}
+    n_regions = len(main.REGION_CURRENCIES)
+    ok = (
+        len(body.get("comparisons", [])) == n_regions * (n_regions - 1) // 2
+        and len(body.get("prices", [])) == n_regions
+        and body.get("risk_level") in ("LOW", "MEDIUM", "HIGH")
+    )
+    print(f"{'OK ' if ok else 'FAIL'} {resp.status_code}  {path}  (stubbed scraper)")
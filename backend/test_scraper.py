@@ -0,0 +1,78 @@
+"""Quick smoke test for the scraper's HTML extraction and page streaming."""
+import asyncio
+
+import scraper
+
+FILLER = "<div class=\"x\">filler</div>\n" * 12_000   # ~340 KB
+
+
+def test_head_first_extraction():
+    # Lower-priority matches near the top, the preferred ones past the 200 KB
+    # head: the large-page fast path must still pick the preferred ones.
+    page = (
+        "<html><head><title>Fallback Title : Amazon.com</title></head><body>"
+        "<span class=\"a-offscreen\">$9.99</span>"
+        "<img data-old-hires=\"https://m.media-amazon.com/images/I/old.jpg\">"
+        + FILLER +
+        "<span id=\"productTitle\"> Real Title </span>"
+        "<span class=\"a-price-whole\">19</span>"
+        "<script>'colorImages': { 'initial': "
+        "[{\"hiRes\": \"https://m.media-amazon.com/images/I/hires.jpg\"}]}</script>"
+        "</body></html>"
+    )
+    assert len(page) > scraper._HEAD_MIN_PAGE
+    title, _, price, images = scraper._extract_all(page)
+    print(f"title={title!r} price={price!r} images={images}")
+    assert title == "Real Title"
+    assert price == "19"
+    assert images == ["https://m.media-amazon.com/images/I/hires.jpg"]
+    # Same answers as scanning the whole document only
+    assert (title, price, images) == (
+        scraper._extract_title(page), scraper._extract_price(page), scraper._extract_images(page)
+    )
+
+
+class _FakeStreamResponse:
+    """Just enough of httpx.Response for _read_page_head."""
+    charset_encoding = "utf-8"
+
+    def __init__(self, chunks: list[bytes]):
+        self.chunks = chunks
+        self.chunks_read = 0
+
+    async def aiter_bytes(self, chunk_size=None):
+        for chunk in self.chunks:
+            self.chunks_read += 1
+            yield chunk
+
+
+def test_read_page_head():
+    # End marker split across two chunks: still seen, nothing after it read
+    resp = _FakeStreamResponse([
+        b"<html>" + b"a" * 100 + b'<div id="detail',
+        b'Bullets_feature_div">',
+        b"<div>reviews</div>" * 100,
+    ])
+    page = asyncio.run(scraper._read_page_head(resp))
+    print(f"split marker: {resp.chunks_read} of {len(resp.chunks)} chunks read")
+    assert resp.chunks_read == 2
+    assert page.endswith('<div id="detailBullets_feature_div">')
+
+    # No marker: reading stops at the byte cap
+    chunk = b"x" * scraper._STREAM_CHUNK
+    resp = _FakeStreamResponse([chunk] * 100)
+    page = asyncio.run(scraper._read_page_head(resp))
+    print(f"byte cap: {len(page)} chars, {resp.chunks_read} of {len(resp.chunks)} chunks read")
+    assert scraper._PAGE_MAX_BYTES <= len(page) < scraper._PAGE_MAX_BYTES + len(chunk)
+    assert resp.chunks_read < len(resp.chunks)
+
+    # Multi-byte UTF-8 character split across chunks decodes intact
+    resp = _FakeStreamResponse([b"<title>Kopfh\xc3", b"\xb6rer</title>"])
+    page = asyncio.run(scraper._read_page_head(resp))
+    print(f"split character: {page!r}")
+    assert page == "<title>Kopfhörer</title>"
+
+
+test_head_first_extraction()
+test_read_page_head()
+print("✅ All tests passed!")
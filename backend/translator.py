@@ -4,12 +4,21 @@ Uses deep-translator (Google Translate) — free, no API key required.
 Includes lightweight local language detection via Unicode ranges & word frequency.
 """
 
-import hashlib
+import asyncio
+import functools
 import logging
 import re
+import threading
 import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from typing import Optional
 
+try:
+    from deep_translator import GoogleTranslator
+except ImportError:  # translation disabled; detection still works
+    GoogleTranslator = None
+
 logger = logging.getLogger("mrcc.translator")
 
 # ── Region → primary language mapping ────────────────────────────────
@@ -48,26 +57,41 @@ _DT_LANG_CODE: dict[str, str] = {
 }
 
 # ── In-memory translation cache ─────────────────────────────────────
-_translation_cache: dict[str, dict] = {}
+# LRU + TTL, bounded; read and written from translate worker threads, hence
+# the lock around every OrderedDict mutation.
+_translation_cache: OrderedDict[tuple[str, str], tuple[float, dict]] = OrderedDict()
+_translation_cache_lock = threading.Lock()
 _CACHE_TTL = 3600  # 1 hour
+_CACHE_MAX_ENTRIES = 4096
 
 
-def _cache_key(text: str, target_lang: str) -> str:
-    h = hashlib.md5(f"{text}:{target_lang}".encode()).hexdigest()
-    return h
+def _cache_key(text: str, target_lang: str) -> tuple[str, str]:
+    # str hashes are computed once and cached on the object, so the tuple
+    # costs nothing per lookup (MD5 re-hashed the whole text every time)
+    return (text, target_lang)
 
 
 def _get_cached(text: str, target_lang: str) -> Optional[dict]:
     key = _cache_key(text, target_lang)
-    entry = _translation_cache.get(key)
-    if entry and (time.time() - entry["ts"]) < _CACHE_TTL:
-        return entry["data"]
-    return None
+    with _translation_cache_lock:
+        entry = _translation_cache.get(key)
+        if entry is None:
+            return None
+        ts, data = entry
+        if time.monotonic() - ts >= _CACHE_TTL:
+            del _translation_cache[key]
+            return None
+        _translation_cache.move_to_end(key)
+        return data
 
 
 def _set_cache(text: str, target_lang: str, data: dict):
     key = _cache_key(text, target_lang)
-    _translation_cache[key] = {"data": data, "ts": time.time()}
+    with _translation_cache_lock:
+        _translation_cache[key] = (time.monotonic(), data)
+        _translation_cache.move_to_end(key)
+        if len(_translation_cache) > _CACHE_MAX_ENTRIES:
+            _translation_cache.popitem(last=False)
 
 
 # ── Language detection (lightweight, no external deps) ───────────────
@@ -76,6 +100,16 @@ _KOREAN_RE = re.compile(r'[\uAC00-\uD7AF\u1100-\u11FF]')
 _ARABIC_RE = re.compile(r'[\u0600-\u06FF]')
 _HINDI_RE = re.compile(r'[\u0900-\u097F]')
 _CHINESE_RE = re.compile(r'[\u4E00-\u9FFF]')
+_KANA_RE = re.compile(r'[\u3040-\u309F\u30A0-\u30FF]')
+# Union of the script ranges above: one search lets Latin-only text skip
+# the five per-script counts
+_NON_LATIN_RE = re.compile(r'[\u0600-\u06FF\u0900-\u097F\u1100-\u11FF\u3040-\u309F\u30A0-\u30FF\u4E00-\u9FFF\uAC00-\uD7AF]')
+_EUROPEAN_WORD_RE = re.compile(r'\b[a-zA-Zäöüßàâéèêëïîôùûçñáéíóúü]+\b')
+_GERMAN_CHARS_RE = re.compile(r'[äöüß]')
+_FRENCH_CHARS_RE = re.compile(r'[àâéèêëïîôùûç]')
+_SPANISH_N_RE = re.compile(r'[ñ]')
+_SPANISH_CHARS_RE = re.compile(r'[ñ¿¡]')
+_SENTENCE_SPLIT_RE = re.compile(r'(?<=[.!?。])\s+')
 
 _GERMAN_MARKERS = {
     'und', 'die', 'der', 'das', 'ist', 'für', 'mit', 'ein', 'eine', 'auf',
@@ -105,46 +139,60 @@ _SPANISH_MARKERS = {
     'táctil', 'compatible', 'acero', 'inoxidable', 'aislado',
 }
 
+# Merged vocabulary: one probe of the page's words against every marker;
+# the per-language intersections then only walk the (few) hits
+_ALL_MARKERS = frozenset(_GERMAN_MARKERS | _FRENCH_MARKERS | _SPANISH_MARKERS)
 
+
+@functools.lru_cache(maxsize=4096)
 def detect_language(text: str, region: str = "") -> str:
     """
     Detect the language of a text string.
     Uses Unicode ranges for CJK/Arabic/Hindi, then word frequency for European languages.
     Falls back to region language if detection is uncertain.
+    Memoised: the same region descriptions are re-detected on every check.
     """
     if not text or len(text.strip()) < 10:
         return REGION_LANGUAGES.get(region, "en")
 
-    # Check for Japanese (hiragana/katakana unique to Japanese)
-    hiragana_katakana = len(re.findall(r'[\u3040-\u309F\u30A0-\u30FF]', text))
-    if hiragana_katakana > 3:
-        return "ja"
+    # Every script/accent check below needs a non-ASCII character
+    ascii_only = text.isascii()
 
-    # Check for Korean
-    if len(_KOREAN_RE.findall(text)) > 5:
-        return "ko"
+    if not ascii_only and _NON_LATIN_RE.search(text):
+        # Check for Japanese (hiragana/katakana unique to Japanese)
+        hiragana_katakana = len(_KANA_RE.findall(text))
+        if hiragana_katakana > 3:
+            return "ja"
 
-    # Check for Hindi/Devanagari
-    if len(_HINDI_RE.findall(text)) > 5:
-        return "hi"
+        # Check for Korean
+        if len(_KOREAN_RE.findall(text)) > 5:
+            return "ko"
 
-    # Check for Arabic
-    if len(_ARABIC_RE.findall(text)) > 5:
-        return "ar"
+        # Check for Hindi/Devanagari
+        if len(_HINDI_RE.findall(text)) > 5:
+            return "hi"
 
-    # Check for Chinese (CJK without Japanese kana)
-    cjk = len(_CHINESE_RE.findall(text))
-    if cjk > 5 and hiragana_katakana == 0:
-        return "zh"
+        # Check for Arabic
+        if len(_ARABIC_RE.findall(text)) > 5:
+            return "ar"
 
-    # European language detection via word frequency
-    words = set(re.findall(r'\b[a-zA-Zäöüßàâéèêëïîôùûçñáéíóúü]+\b', text.lower()))
+        # Check for Chinese (CJK without Japanese kana)
+        cjk = len(_CHINESE_RE.findall(text))
+        if cjk > 5 and hiragana_katakana == 0:
+            return "zh"
 
-    de_score = len(words & _GERMAN_MARKERS)
-    fr_score = len(words & _FRENCH_MARKERS)
-    es_score = len(words & _SPANISH_MARKERS)
-
-    max_score = max(de_score, fr_score, es_score)
+    # European language detection via word frequency
+    lowered = text.lower()
+    hits = _ALL_MARKERS.intersection(_EUROPEAN_WORD_RE.findall(lowered))
+
+    # No language can reach the 3-marker threshold with fewer than 3 hits
+    if len(hits) >= 3:
+        de_score = len(hits & _GERMAN_MARKERS)
+        fr_score = len(hits & _FRENCH_MARKERS)
+        es_score = len(hits & _SPANISH_MARKERS)
+        max_score = max(de_score, fr_score, es_score)
+    else:
+        max_score = 0
     if max_score >= 3:
         if de_score == max_score and de_score > fr_score and de_score > es_score:
             return "de"
@@ -153,16 +201,19 @@ def detect_language(text: str, region: str = "") -> str:
         if es_score == max_score and es_score > de_score and es_score > fr_score:
             return "es"
 
+    if ascii_only:
+        return REGION_LANGUAGES.get(region, "en")
+
     # German-specific characters (umlauts are strong signals)
-    if re.search(r'[äöüß]', text.lower()):
+    if _GERMAN_CHARS_RE.search(lowered):
         return "de"
 
     # French-specific accented chars
-    if re.search(r'[àâéèêëïîôùûç]', text.lower()) and not re.search(r'[ñ]', text.lower()):
+    if _FRENCH_CHARS_RE.search(lowered) and not _SPANISH_N_RE.search(lowered):
         return "fr"
 
     # Spanish ñ or inverted punctuation
-    if re.search(r'[ñ¿¡]', text.lower()):
+    if _SPANISH_CHARS_RE.search(lowered):
         return "es"
 
     return REGION_LANGUAGES.get(region, "en")
@@ -170,6 +221,34 @@ def detect_language(text: str, region: str = "") -> str:
 
 # ── Free translation (deep-translator — Google Translate, no key) ────
 
+# One GoogleTranslator per (src, tgt) per worker thread: instances keep
+# per-call state in self._url_params, so they can't be shared across the
+# concurrent to_thread translations.
+_translators = threading.local()
+
+
+def _get_translator(src: str, tgt: str):
+    cache = getattr(_translators, "by_pair", None)
+    if cache is None:
+        cache = _translators.by_pair = {}
+    translator = cache.get((src, tgt))
+    if translator is None:
+        translator = cache[(src, tgt)] = GoogleTranslator(source=src, target=tgt)
+    return translator
+
+
+# deep-translator's translate_batch is just a loop of translate() calls (one
+# HTTP request per text), so long descriptions send their chunks in parallel
+# instead.  Separate from the event loop's default executor, which is where
+# _translate_text itself runs.
+_CHUNK_WORKERS = 4
+_chunk_pool = ThreadPoolExecutor(max_workers=_CHUNK_WORKERS, thread_name_prefix="mrcc-translate")
+
+
+def _translate_chunk(chunk: str, src: str, tgt: str) -> Optional[str]:
+    return _get_translator(src, tgt).translate(chunk)
+
+
 def _translate_text(text: str, source_lang: str, target_lang: str = "en") -> Optional[str]:
     """
     Translate text using deep-translator's GoogleTranslator (free, no API key).
@@ -180,19 +259,20 @@ def _translate_text(text: str, source_lang: str, target_lang: str = "en") -> Opt
     if cached:
         return cached.get("translated_text")
 
-    try:
-        from deep_translator import GoogleTranslator
+    if GoogleTranslator is None:
+        logger.error("deep-translator not installed. Run: pip install deep-translator")
+        return None
 
+    try:
         src = _DT_LANG_CODE.get(source_lang, source_lang)
         tgt = _DT_LANG_CODE.get(target_lang, target_lang)
-
         # Google Translate has a ~5000 char limit per request
         MAX_CHUNK = 4500
         if len(text) <= MAX_CHUNK:
-            translated = GoogleTranslator(source=src, target=tgt).translate(text)
+            translated = _get_translator(src, tgt).translate(text)
         else:
             # Split on sentence boundaries
-            sentences = re.split(r'(?<=[.!?。])\s+', text)
+            sentences = _SENTENCE_SPLIT_RE.split(text)
             chunks: list[str] = []
             current = ""
             for s in sentences:
@@ -205,22 +285,41 @@ def _translate_text(text: str, source_lang: str, target_lang: str = "en") -> Opt
             if current:
                 chunks.append(current)
 
-            translator = GoogleTranslator(source=src, target=tgt)
-            translated_parts = [translator.translate(chunk) for chunk in chunks]
+            # Each pool thread gets its own GoogleTranslator via _get_translator
+            n = len(chunks)
+            translated_parts = list(_chunk_pool.map(_translate_chunk, chunks, [src] * n, [tgt] * n))
             translated = " ".join(p for p in translated_parts if p)
 
         if translated:
             _set_cache(text, target_lang, {"translated_text": translated})
             return translated
 
-    except ImportError:
-        logger.error("deep-translator not installed. Run: pip install deep-translator")
     except Exception as e:
         logger.warning(f"Translation failed for {source_lang}->{target_lang}: {e}")
 
     return None
 
 
+# ── In-flight coalescing ─────────────────────────────────────────────
+# GoogleTranslator has no real batch endpoint (translate_batch loops one
+# call per text), so the win under concurrent load is to share identical
+# translations: overlapping /check requests for the same ASIN await one
+# upstream call per distinct text instead of each issuing their own.
+_inflight: dict[tuple[str, str, str], asyncio.Future] = {}
+
+
+async def _translate_shared(text: str, source_lang: str, target_lang: str) -> Optional[str]:
+    key = (text, source_lang, target_lang)
+    task = _inflight.get(key)
+    if task is None:
+        # Run sync translator in thread pool to avoid blocking the event loop
+        task = asyncio.ensure_future(asyncio.to_thread(_translate_text, text, source_lang, target_lang))
+        _inflight[key] = task
+        task.add_done_callback(lambda _: _inflight.pop(key, None))
+    # Shielded so one cancelled caller doesn't abort the others' translation
+    return await asyncio.shield(task)
+
+
 # ── Batch translation for all regions ────────────────────────────────
 
 async def translate_descriptions(
@@ -238,12 +337,25 @@ async def translate_descriptions(
         "was_translated": <bool>,
     }
     """
-    import asyncio
+    # ASCII text from a region whose language already is the target (US/UK/
+    # CA/AU/IN → en) is taken as-is; detection would only run its marker
+    # scoring, which misfires on English (e.g. "no", "compatible", "al")
+    langs = {
+        region: target_lang
+        if REGION_LANGUAGES.get(region) == target_lang and text.isascii()
+        else detect_language(text, region)
+        for region, text in descriptions.items()
+    }
 
-    results: dict[str, dict] = {}
+    # Every region needing translation goes out at once
+    pending = [region for region, lang in langs.items() if lang != target_lang]
+    translations = dict(zip(pending, await asyncio.gather(*(
+        _translate_shared(descriptions[region], langs[region], target_lang) for region in pending
+    ))))
 
+    results: dict[str, dict] = {}
     for region, text in descriptions.items():
-        lang = detect_language(text, region)
+        lang = langs[region]
         lang_name = LANGUAGE_NAMES.get(lang, lang)
 
         if lang == target_lang:
@@ -255,8 +367,7 @@ async def translate_descriptions(
                 "was_translated": False,
             }
         else:
-            # Run sync translator in thread pool to avoid blocking the event loop
-            translated = await asyncio.to_thread(_translate_text, text, lang, target_lang)
+            translated = translations[region]
             results[region] = {
                 "original": text,
                 "translated": translated if translated else text,